@@ -1,34 +1,107 @@
-import threading
-from bs4 import BeautifulSoup
-from io import StringIO
-from typing import Dict, List, Any
-import concurrent.futures
+from io import BytesIO
+from typing import Dict, List, Any, Optional
+from diskcache import Cache
+from tqdm.auto import tqdm
+from urllib.parse import quote
 import pandas as pd
-import requests
-import inspect
+import numpy as np
+import httpx
+import asyncio
+import orjson
 import pickle
+import random
+import hashlib
+import html
+import re
 import time
-import csv
+import sys
 import os
 
+# Strip CrossRef JATS/HTML markup; block-level tags become spaces, inline tags are removed.
+_BLOCK_TAG_RE = re.compile(r"</?(?:jats:)?(?:p|sec|title|list|list-item|br|div)\b[^>]*>", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+# Columns of the abstract map; the abstract cache holds only ABSTRACT_COLUMNS[2:].
+ABSTRACT_COLUMNS = ['apsr_title', 'citing_doi', 'citing_title', 'citing_abstract', 'crossref_url']
+
+
+class HostThrottle:
+    # Per-host concurrency limit and request spacing.
+    def __init__(self, max_concurrent: int, max_rate: float = 0.0):
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        # Requests are spaced by max_rate (requests/sec) until the host advertises its limit.
+        self.min_interval: float = 1.0 / max_rate if max_rate > 0 else 0.0
+        self.next_request_at: float = 0.0
+        # AIMD slowdown state: the rate is halved per burst of 429s, held, then recovered linearly.
+        self.rate_scale: float = 1.0
+        self.slowdown_at: float = float("-inf")
+        self.slowdown_period: float = 30.0
+        self.recovery_rate: float = 0.1
+        self.min_rate_scale: float = 1.0 / 16
+
+    async def __aenter__(self):
+        await self.semaphore.acquire()
+        try:
+            now = time.monotonic()
+            start_at = max(now, self.next_request_at)
+            self.next_request_at = start_at + self.min_interval / self.RateScale(now)
+            if start_at > now:
+                await asyncio.sleep(start_at - now)
+        except BaseException:
+            self.semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.semaphore.release()
+
+    def Pause(self, seconds: float):
+        self.next_request_at = max(self.next_request_at, time.monotonic() + seconds)
+
+    def RateScale(self, now: float) -> float:
+        recovering_for = now - self.slowdown_at - self.slowdown_period
+        if recovering_for <= 0:
+            return self.rate_scale
+        return min(1.0, self.rate_scale + self.recovery_rate * recovering_for)
+
+    def SlowDown(self, sent_at: float):
+        # Rejections of requests sent before the last slowdown belong to the same burst.
+        if sent_at < self.slowdown_at:
+            return
+        now = time.monotonic()
+        self.rate_scale = max(self.RateScale(now) / 2.0, self.min_rate_scale)
+        self.slowdown_at = now
+
+    def UpdateFromHeaders(self, headers):
+        # CrossRef advertises its quota as e.g. "X-Rate-Limit-Limit: 50" with "X-Rate-Limit-Interval: 1s".
+        limit = headers.get("X-Rate-Limit-Limit")
+        interval = headers.get("X-Rate-Limit-Interval")
+        if not limit or not interval:
+            return
+        try:
+            calls = int(limit)
+            seconds = float(interval.strip().rstrip("s"))
+        except ValueError:
+            return
+        if calls > 0:
+            self.min_interval = seconds / calls
+
 
 class PostProcessAPSR:
     def __init__(self, attempt_cache_load: bool = False):
         # Semaphore for post-processing the Cambridge Core citations.
         self.cc_citations_processed = False
 
-        # Citation data: key = apsr_title, value = list of DOIs.
-        self.citation_data: Dict[str, List[Any]] = {}
-
-        # Each value is a dictionary with keys: apsr_title, citing_doi, citing_title, citing_abstract, crossref_url.
-        self.abstract_cache: Dict[str, Dict[str, Any]] = {}
-
         # Default paths for input and output files.
         self.input_csv_path: str = "./input_data/apsr_results.csv"
         self.citations_output_csv_path: str = "./output_data/combined_apsr_citations.csv"
         self.abstract_map_csv_path: str = "./output_data/apsr_abstract_map.csv"
-        self.citations_cache_path: str = "./cache/citation_data.pkl"
-        self.abstract_cache_path: str = "./cache/abstract_cache.pkl"
+        self.abstract_map_parquet_path: str = "./output_data/apsr_abstract_map.parquet"
+        self.citations_cache_path: str = "./cache/citation_data"
+        self.abstract_cache_path: str = "./cache/abstract_cache"
+        self.legacy_citations_cache_path: str = "./cache/citation_data.pkl"
+        self.legacy_abstract_cache_path: str = "./cache/abstract_cache.pkl"
+        self.http_cache_path: str = "./cache/http"
         self.credentials_path: str = "./credentials.txt"
         self.log_path: str = "./log.txt"
 
@@ -36,6 +109,16 @@ class PostProcessAPSR:
         self.loaded_cached_citation_data = False
         self.loaded_cached_abstract_data = False
 
+        # On-disk stores for citation and abstract data; eviction is disabled as they are the primary copy.
+        # Citation data: key = apsr_title, value = list of DOIs.
+        self.citation_data = Cache(self.citations_cache_path, eviction_policy="none")
+        # Abstract data: key = citing DOI, value = tuple ordered as ABSTRACT_COLUMNS[2:].
+        self.abstract_cache = Cache(self.abstract_cache_path, eviction_policy="none")
+
+        # Cache of HTTP responses keyed on URL; stale entries are revalidated against their ETag.
+        self.http_cache = Cache(self.http_cache_path)
+        self.http_cache_max_age: int = 86400 * 30
+
         # DataFrame for input CSV from Cambridge Core.
         self.df: pd.DataFrame = None
         self.LoadCamCoreCSV()
@@ -43,20 +126,40 @@ class PostProcessAPSR:
         # Compute DOI prefix length.
         self.doi_prefix_length: int = len("https://doi.org/")
 
-        self.credentials = self.LoadCredentials()
+        # Number of DOIs per CrossRef filter query (bounded by the URL length CrossRef accepts).
+        self.crossref_batch_size: int = 40
 
-        # Create a persistent session for HTTP requests.
-        self.session = requests.Session()
+        self.credentials = self.LoadCredentials()
 
-        # Lock for thread-safe updates to abstract_cache.
-        self.abstract_lock = threading.Lock()
+        # CrossRef URL templates; DOIs are percent-encoded when the templates are filled in.
+        email = (self.credentials or {}).get("email", "")
+        mailto = f"mailto={quote(email)}" if email else ""
+        # Batch query over many DOIs, trimmed to the fields we read.
+        self._crossref_batch_url_tmpl = (
+            "https://api.crossref.org/works?filter={filter}&select=DOI,title,abstract"
+            f"&rows={self.crossref_batch_size}" + (f"&{mailto}" if mailto else ""))
+        self._crossref_work_url_tmpl = "https://api.crossref.org/works/{doi}" + (f"?{mailto}" if mailto else "")
+
+        # Per-host HTTP clients and throttles; created by Run().
+        self.camcore_max_connections: int = 8
+        self.crossref_max_connections: int = 32
+        # CrossRef's published polite-pool limit, used until its X-Rate-Limit headers are seen.
+        self.crossref_max_rate: float = 50.0
+        self._camcore_client: Optional[httpx.AsyncClient] = None
+        self._crossref_client: Optional[httpx.AsyncClient] = None
+        self._camcore_throttle: Optional[HostThrottle] = None
+        self._crossref_throttle: Optional[HostThrottle] = None
 
         if attempt_cache_load:
             self.LoadCachedData()
+        else:
+            # Without cache loading every run starts from scratch, including cached HTTP responses.
+            self.citation_data.clear()
+            self.abstract_cache.clear()
+            self.http_cache.clear()
 
         # Initialize the log with a message of type "info" indicating the start date/time of the process.
-        self.log_helper = lambda: (inspect.currentframe().f_back.f_code.co_name,
-                                   inspect.currentframe().f_back.f_lineno)
+        self.log_helper = lambda: (sys._getframe(1).f_code.co_name, sys._getframe(1).f_lineno)
         self.log = {
             'info': [f"Post-processing started at {time.strftime('%Y-%m-%d %H:%M:%S')}"]}
 
@@ -69,29 +172,63 @@ class PostProcessAPSR:
                 f"[ {type} ]: {fn_name} (line {line_no}): {message}")
 
     def LoadCachedData(self):
-        # Load cached citation data.
-        if os.path.exists(self.citations_cache_path):
-            try:
-                with open(self.citations_cache_path, "rb") as f:
-                    self.citation_data = pickle.load(f)
-                    self.loaded_cached_citation_data = True
-            except Exception as e:
-                fn, line = self.log_helper()
-                self.Log("error", fn, line,
-                         f"Failed to load citation data: {e}")
-                raise e
+        # Import caches written by earlier versions into the empty stores.
+        try:
+            if not len(self.citation_data) and os.path.exists(self.legacy_citations_cache_path):
+                with self.citation_data.transact():
+                    for title, dois in self.LoadCache(self.legacy_citations_cache_path).items():
+                        self.citation_data[title] = dois
+            self.loaded_cached_citation_data = len(self.citation_data) > 0
+        except Exception as e:
+            fn, line = self.log_helper()
+            self.Log("error", fn, line,
+                     f"Failed to load citation data: {e}")
+            raise e
 
-        # Load cached abstract data.
-        if os.path.exists(self.abstract_cache_path):
-            try:
-                with open(self.abstract_cache_path, "rb") as f:
-                    self.abstract_cache = pickle.load(f)
-                    self.loaded_cached_abstract_data = True
-            except Exception as e:
-                fn, line = self.log_helper()
-                self.Log("error", fn, line,
-                         f"Failed to load abstract data: {e}")
-                raise e
+        try:
+            if not len(self.abstract_cache):
+                if os.path.exists(self.abstract_map_parquet_path):
+                    abstract_df = pd.read_parquet(self.abstract_map_parquet_path, engine="pyarrow")
+                    records = ((record[1], record[2:])
+                               for record in abstract_df.astype(object).itertuples(index=False, name=None))
+                elif os.path.exists(self.legacy_abstract_cache_path):
+                    records = ((doi, tuple(record.get(key, "") for key in ABSTRACT_COLUMNS[2:]))
+                               for doi, record in self.LoadCache(self.legacy_abstract_cache_path).items())
+                else:
+                    records = ()
+                with self.abstract_cache.transact():
+                    for doi, record in records:
+                        self.abstract_cache[doi] = record
+            self.loaded_cached_abstract_data = len(self.abstract_cache) > 0
+        except Exception as e:
+            fn, line = self.log_helper()
+            self.Log("error", fn, line,
+                     f"Failed to load abstract data: {e}")
+            raise e
+
+    def LoadCache(self, path: str) -> Any:
+        # Legacy caches are the plain pickles written by earlier versions.
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def CitationSnapshot(self) -> Dict[str, List[Any]]:
+        # Materialize the citation store, in insertion order, for whole-table operations.
+        return {title: self.citation_data[title] for title in self.citation_data}
+
+    def SaveAbstractMap(self) -> pd.DataFrame:
+        # Export the abstract map as Parquet, one row per (apsr_title, citing_doi) pair.
+        def Rows():
+            for apsr_title, dois in self.CitationSnapshot().items():
+                for doi in dois:
+                    record = self.abstract_cache.get(doi) if doi else None
+                    if record is not None:
+                        yield (apsr_title, doi, *record)
+        abstract_df = pd.DataFrame.from_records(Rows(), columns=ABSTRACT_COLUMNS).astype("string[pyarrow]")
+        abstract_df["apsr_title"] = abstract_df["apsr_title"].astype("category")
+        tmp_path = f"{self.abstract_map_parquet_path}.tmp"
+        abstract_df.to_parquet(tmp_path, engine="pyarrow", compression="zstd", index=False)
+        os.replace(tmp_path, self.abstract_map_parquet_path)
+        return abstract_df
 
     def LoadCredentials(self):
         if os.path.exists(self.credentials_path):
@@ -108,32 +245,64 @@ class PostProcessAPSR:
                 return None
             return credentials
 
-    def WebFetch(self, url: str, base_timeout: int = 15, max_attempts: int = 5) -> requests.Response:
-        wait = base_timeout
+    def NewClient(self, max_connections: int) -> httpx.AsyncClient:
+        # One HTTP/2 client per host; idle connections outlive the longest Retry-After pause (180 sec).
+        return httpx.AsyncClient(http2=True, follow_redirects=True, limits=httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=max_connections, keepalive_expiry=240))
+
+    async def WebFetch(self, client: httpx.AsyncClient, url: str, throttle: HostThrottle,
+                       base_timeout: int = 15, max_attempts: int = 3, base_backoff: float = 2.0,
+                       raise_client_errors: bool = False) -> Optional[bytes]:
+        # Cached entries are (fetched_at, etag, content).
+        cache_key = hashlib.sha1(url.encode()).hexdigest()
+        cached = self.http_cache.get(cache_key)
+        if cached is not None and time.time() - cached[0] < self.http_cache_max_age:
+            return cached[2]
+        headers = {"If-None-Match": cached[1]} if cached is not None and cached[1] else {}
+
         for attempt in range(max_attempts):
+            backoff = base_backoff * 2 ** attempt + random.uniform(0, 1)
             try:
-                response = self.session.get(url, timeout=wait)
+                async with throttle:
+                    sent_at = time.monotonic()
+                    response = await client.get(url, timeout=base_timeout * 2 ** attempt, headers=headers)
+                throttle.UpdateFromHeaders(response.headers)
                 if response.status_code == 200:
-                    return response
+                    self.http_cache.set(cache_key, (time.time(), response.headers.get("ETag"), response.content))
+                    return response.content
+                elif response.status_code == 304 and cached is not None:
+                    # Unchanged since it was cached; refresh the entry's age.
+                    self.http_cache.set(cache_key, (time.time(), cached[1], cached[2]))
+                    return cached[2]
                 elif response.status_code == 429:
-                    # Use safe conversion for the Retry-After header (capped at 180 sec).
-                    retry_after_header = response.headers.get("Retry-After")
-                    if retry_after_header is not None:
-                        try:
-                            retry_after = int(retry_after_header)
-                        except ValueError:
-                            retry_after = wait
-                    else:
-                        retry_after = wait
-                    time.sleep(min(retry_after, 180))
+                    # Use safe conversion for the Retry-After header (capped at 180 sec), and pause the host.
+                    try:
+                        retry_after = min(int(response.headers.get("Retry-After", "")), 180)
+                    except ValueError:
+                        retry_after = backoff
+                    backoff = retry_after + random.uniform(0, 1)
+                    throttle.Pause(backoff)
+                    throttle.SlowDown(sent_at)
+                elif response.status_code >= 500:
+                    fn, line = self.log_helper()
+                    self.Log("error", fn, line,
+                             f"Webfetch attempt {attempt+1} failed for {url}: HTTP {response.status_code}")
                 else:
-                    response.raise_for_status()
-            except requests.RequestException as e:
+                    # Other client errors (e.g. 404) will not succeed on retry.
+                    fn, line = self.log_helper()
+                    self.Log("error", fn, line,
+                             f"Webfetch failed for {url}: HTTP {response.status_code}; not retrying.")
+                    if raise_client_errors:
+                        response.raise_for_status()
+                    return None
+            except httpx.HTTPStatusError:
+                raise
+            except httpx.HTTPError as e:
                 fn, line = self.log_helper()
-                self.Log("error", fn, line, f"Webfetch attempt {attempt+1} failed for {url}: \
-                         Response: {response}; Exception: {e}")
-            wait = min(wait * 2, 180)
-            time.sleep(wait)
+                self.Log("error", fn, line,
+                         f"Webfetch attempt {attempt+1} failed for {url}: Exception: {e!r}")
+            if attempt + 1 < max_attempts:
+                await asyncio.sleep(backoff)
 
         fn, line = self.log_helper()
         self.Log("error", fn, line,
@@ -143,7 +312,9 @@ class PostProcessAPSR:
     def LoadCamCoreCSV(self):
         try:
             print("Loading input CSV...")
-            self.df = pd.read_csv(self.input_csv_path)
+            # Only these two columns are used downstream, and always as strings.
+            self.df = pd.read_csv(self.input_csv_path, usecols=["title", "all_citing_papers_link"],
+                                  dtype="string[pyarrow]", engine="pyarrow")
         except Exception as e:
             fn, line = self.log_helper()
             self.Log("error", fn, line,
@@ -159,15 +330,28 @@ class PostProcessAPSR:
             fn, line = self.log_helper()
             self.Log("error", fn, line, f"Failed to write CSV: {e}")
 
-    def ProgressBar(self, iteration: int, total: int, prefix: str = '', length: int = 25):
-        percent = "{0:.1f}".format(100 * (iteration / float(max(1, total))))
-        filled_length = int(length * iteration // total)
-        bar = '█' * filled_length + '-' * (length - filled_length)
-        print(f'\r{prefix} |{bar}| {percent}% Complete', end='\r')
-        if iteration == total:
-            print()
+    async def RunWorkers(self, worker, items, num_workers: int):
+        # Run worker(*item) for every item on a fixed pool of coroutines.
+        items = iter(items)
+
+        async def Work():
+            for item in items:
+                await worker(*item)
 
-    def PostProcessCitations(self):
+        await asyncio.gather(*[Work() for _ in range(num_workers)])
+
+    async def Run(self):
+        # Both phases share one event loop, and one client and throttle per host.
+        self._camcore_throttle = HostThrottle(self.camcore_max_connections)
+        self._crossref_throttle = HostThrottle(self.crossref_max_connections, self.crossref_max_rate)
+        async with self.NewClient(self.camcore_max_connections) as camcore_client, \
+                self.NewClient(self.crossref_max_connections) as crossref_client:
+            self._camcore_client = camcore_client
+            self._crossref_client = crossref_client
+            await self.PostProcessCitations()
+            await self.PostProcessAbstracts()
+
+    async def PostProcessCitations(self):
         try:
             if self.df is None:
                 fn, line = self.log_helper()
@@ -179,179 +363,211 @@ class PostProcessAPSR:
             #   [ 1st Column ]: Each row contains a one-line text description (such as the author and page number) of a paper, `R`,
             #       which cites the original paper, `P`.
             #   [ 2nd Column ]: Each row contains the DOI of a paper, `R`, which cites the original paper, `P`.
-            if self.loaded_cached_citation_data:
-                cached_length = len(self.citation_data)
-                self.citation_data.update(
-                    {title: [] for title in self.df["title"] if title not in self.citation_data})
-                if len(self.citation_data) == cached_length:
-                    fn, line = self.log_helper()
-                    self.Log("info", fn, line,
-                             "No new citation data to process; continuing.")
-                    return
-            else:
-                self.citation_data = {title: [] for title in self.df["title"]}
-
-            def ProcessCitationRow(citation_row):
-                paper_title = citation_row["title"]
-                cambridge_core_citations_url = citation_row["all_citing_papers_link"]
-                returned_citations = []
-                res = self.WebFetch(cambridge_core_citations_url)
-                if res is None:
+            with self.citation_data.transact():
+                for title in self.df["title"]:
+                    self.citation_data.add(title, [])
+
+            # Only fetch papers without citations.
+            pending = np.array([not self.citation_data[title] for title in self.df["title"]], dtype=bool)
+            if not pending.any():
+                fn, line = self.log_helper()
+                self.Log("info", fn, line,
+                         "No new citation data to process; continuing.")
+                return
+
+            async def ProcessCitationRow(paper_title, cambridge_core_citations_url):
+                body = await self.WebFetch(self._camcore_client, cambridge_core_citations_url, self._camcore_throttle)
+                if body is None:
                     fn, line = self.log_helper()
                     self.Log(
                         "error", fn, line, f"Failed to fetch {cambridge_core_citations_url}; skipping.")
                     return paper_title, []
-                reader = csv.reader(StringIO(res.text))
-                for entry in reader:
-                    if len(entry) < 2:
-                        fn, line = self.log_helper()
-                        self.Log(
-                            "error", fn, line, f"Invalid CSV entry: {entry} for {paper_title}; skipping.")
-                        continue
-                    doi = entry[1].strip()
-                    if doi == "DOI":
-                        continue
-                    elif len(doi) > self.doi_prefix_length:
-                        returned_citations.append(doi)
-                    else:
-                        fn, line = self.log_helper()
-                        self.Log(
-                            "error", fn, line, f"Invalid DOI: '{doi}' for {paper_title}; skipping.")
-                        returned_citations.append("")
+                # Only the DOI column is needed; the header row is consumed by the parser.
+                try:
+                    doi_series = pd.read_csv(BytesIO(body), encoding="utf-8", usecols=[1], header=0,
+                                             dtype=str, engine="c").iloc[:, 0].fillna("").str.strip()
+                except (pd.errors.EmptyDataError, ValueError) as e:
+                    fn, line = self.log_helper()
+                    self.Log(
+                        "error", fn, line, f"Invalid citations CSV for {paper_title}: {e}; skipping.")
+                    return paper_title, []
+                valid = doi_series.str.len() > self.doi_prefix_length
+                invalid_count = int((~valid).sum())
+                if invalid_count:
+                    fn, line = self.log_helper()
+                    self.Log(
+                        "error", fn, line, f"{invalid_count} invalid DOI(s) for {paper_title}; left blank.")
+                returned_citations = doi_series.where(valid, "").tolist()
                 return paper_title, returned_citations
 
-            pbar_completed = 0
-            total_papers = len(self.df)
-            with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-                futures = [executor.submit(ProcessCitationRow, row)
-                           for _, row in self.df.iterrows()]
-                for future in concurrent.futures.as_completed(futures):
-                    try:
-                        paper_title, citations = future.result()
-                        if paper_title and citations:
-                            self.citation_data.setdefault(
-                                paper_title, []).extend(citations)
-                    except Exception as e:
-                        fn, line = self.log_helper()
-                        self.Log("error", fn, line,
-                                 f"Failed to process citation row: {e}")
-                    pbar_completed += 1
-                    self.ProgressBar(pbar_completed, total_papers,
-                                     prefix="Processing Citations")
-
-            max_len = max(len(cites) for cites in self.citation_data.values())
-            for key in self.citation_data:
-                self.citation_data[key].extend(
-                    [''] * (max_len - len(self.citation_data[key])))
-            self.OutputCSV(pd.DataFrame(self.citation_data),
+            total_papers = int(pending.sum())
+
+            async def ProcessAndRecordCitationRow(pbar, paper_title, cambridge_core_citations_url):
+                try:
+                    paper_title, citations = await ProcessCitationRow(
+                        paper_title, cambridge_core_citations_url)
+                    if paper_title and citations:
+                        self.citation_data[paper_title] = citations
+                except Exception as e:
+                    fn, line = self.log_helper()
+                    self.Log("error", fn, line,
+                             f"Failed to process citation row: {e}")
+                pbar.update(1)
+
+            # Iterate the two columns directly.
+            titles = self.df["title"].to_numpy()[pending]
+            urls = self.df["all_citing_papers_link"].to_numpy()[pending]
+            with tqdm(total=total_papers, desc="Processing Citations") as pbar:
+                await self.RunWorkers(ProcessAndRecordCitationRow,
+                                      ((pbar, title, url) for title, url in zip(titles, urls)),
+                                      self.camcore_max_connections)
+
+            # One column per paper, padded with blanks.
+            self.OutputCSV(pd.DataFrame({title: pd.Series(dois, dtype=object)
+                                         for title, dois in self.CitationSnapshot().items()}).fillna(""),
                            self.citations_output_csv_path)
             self.cc_citations_processed = True
-            with open(self.citations_cache_path, "wb") as f:
-                pickle.dump(self.citation_data, f)
         except Exception as e:
             fn, line = self.log_helper()
             self.Log("error", fn, line,
                      f"Failed to process Cambridge Core citations: {e}")
             raise e
 
-    def PostProcessAbstracts(self):
+    async def PostProcessAbstracts(self):
         try:
             if not self.cc_citations_processed and not self.loaded_cached_citation_data:
-                self.PostProcessCitations()
-
-            # Build list of (apsr_title, doi) pairs that need processing.
-            to_process = []
-            for apsr_title, doi_list in self.citation_data.items():
-                for doi in doi_list:
-                    # Skip blank DOIs.
-                    if not doi.strip():
-                        continue
-                    record = self.abstract_cache.get(doi, {})
-                    if (not record.get('citing_title') or not record.get('citing_abstract') or
-                        not record.get('apsr_title') or not record.get('citing_doi') or
-                            not record.get('crossref_url')):
-                        to_process.append((apsr_title, doi))
+                await self.PostProcessCitations()
+
+            # Process each distinct citing DOI once.
+            dois = pd.Series([doi for doi_list in self.CitationSnapshot().values() for doi in doi_list],
+                             dtype=object).drop_duplicates()
+            dois = dois[dois.str.strip() != ""]
+
+            # Skip DOIs with a complete cached record.
+            cached_dois = set()
+            for doi in dois:
+                record = self.abstract_cache.get(doi)
+                if record is not None and all(record):
+                    cached_dois.add(doi)
+            dois = dois[~dois.isin(cached_dois)]
+
+            # Strip the DOI prefix (if present) and stray semicolons for the CrossRef API.
+            crossref_dois = dois.str.removeprefix("https://doi.org/").str.replace(";", "", regex=False).str.strip()
+            to_process = list(zip(dois, crossref_dois))
+
+            # Fetch DOIs which differ only in prefix or case once.
+            dois_by_crossref_doi: Dict[str, List[Any]] = {}
+            for doi, crossref_doi in to_process:
+                dois_by_crossref_doi.setdefault(crossref_doi.lower(), []).append((doi, crossref_doi))
+            unique_dois = list(dois_by_crossref_doi)
 
             total_to_process = len(to_process)
-            print(f"Total abstract entries to process: {total_to_process}")
-            processed_count = 0
-
-            def ProcessAbstractRow(pair):
-                apsr_title, doi = pair
-                # Handle DOI prefix if not present.
-                if doi.startswith("https://doi.org/"):
-                    crossref_doi = (doi[self.doi_prefix_length:]).replace(
-                        ';', '').strip()
+            print(f"Total abstract entries to process: {total_to_process} ({len(unique_dois)} unique DOIs)")
+
+            def CleanText(value):
+                if isinstance(value, list):
+                    value = " ".join(value)
+                value = value or ""
+                # Only strip markup when there is some.
+                if "<" in value or "&" in value:
+                    value = html.unescape(_TAG_RE.sub("", _BLOCK_TAG_RE.sub(" ", value)))
+                # Collapse whitespace so abstracts stay on one CSV line.
+                return " ".join(value.split())
+
+            async def FetchWork(crossref_doi):
+                # Single-work lookup for DOIs a batch query did not return.
+                url = self._crossref_work_url_tmpl.format(doi=quote(crossref_doi, safe="/"))
+                body = await self.WebFetch(self._crossref_client, url, self._crossref_throttle)
+                if body is None:
+                    return None
+                return orjson.loads(body).get("message", {})
+
+            async def ProcessAbstractBatch(batch):
+                url = self._crossref_batch_url_tmpl.format(
+                    filter=",".join(f"doi:{quote(crossref_doi, safe='')}" for crossref_doi in batch))
+
+                try:
+                    body = await self.WebFetch(self._crossref_client, url, self._crossref_throttle,
+                                               raise_client_errors=True)
+                except httpx.HTTPStatusError:
+                    # A client error repeats on every run, so split the batch.
+                    if len(batch) == 1:
+                        items = []
+                    else:
+                        halves = await asyncio.gather(ProcessAbstractBatch(batch[:len(batch) // 2]),
+                                                      ProcessAbstractBatch(batch[len(batch) // 2:]))
+                        return halves[0] + halves[1]
                 else:
-                    crossref_doi = doi.replace(';', '').strip()
-
-                url = f"https://api.crossref.org/works/{crossref_doi}"
-                if self.credentials.get("email", ""):
-                    url += f"?mailto={self.credentials['email']}"
-                
-                res = self.WebFetch(url)
-                if res is None:
+                    if body is None:
+                        # Retries are exhausted; skip the batch.
+                        fn, line = self.log_helper()
+                        self.Log("error", fn, line,
+                                 f"Failed to fetch batch of {len(batch)} DOIs from {url}; continuing.")
+                        return []
+                    items = orjson.loads(body).get("message", {}).get("items", [])
+
+                # DOIs are case-insensitive.
+                works = {item.get("DOI", "").lower(): item for item in items}
+                # Look up DOIs missing from the response one at a time.
+                missing = [batch_doi for batch_doi in batch if batch_doi not in works]
+                if missing:
+                    fetched = await asyncio.gather(*[FetchWork(dois_by_crossref_doi[batch_doi][0][1])
+                                                     for batch_doi in missing])
+                    works.update(zip(missing, fetched))
+                rows = []
+                for batch_doi in batch:
+                    work = works.get(batch_doi)
+                    if work is None:
+                        continue
+                    citing_title = CleanText(work.get("title"))
+                    citing_abstract = CleanText(work.get("abstract"))
+                    for doi, crossref_doi in dois_by_crossref_doi[batch_doi]:
+                        work_url = self._crossref_work_url_tmpl.format(doi=quote(crossref_doi, safe="/"))
+                        rows.append((doi, citing_title, citing_abstract, work_url))
+                return rows
+
+            # Producers only fetch; a single consumer writes records to abstract_cache.
+            results: asyncio.Queue = asyncio.Queue(maxsize=1024)
+
+            async def ProduceAbstractBatch(pbar, batch):
+                try:
+                    rows = await ProcessAbstractBatch(batch)
+                    # Count DOIs which produced no rows as done.
+                    pbar.update(sum(len(dois_by_crossref_doi[batch_doi]) for batch_doi in batch) - len(rows))
+                    for result in rows:
+                        await results.put(result)
+                except Exception as e:
                     fn, line = self.log_helper()
                     self.Log("error", fn, line,
-                             f"Failed to fetch {url}; continuing.")
-                    return (apsr_title, doi, "", "", url)
-                data = res.json().get("message", {})
-                
-
-                title_val = data.get("title", "")
-                if isinstance(title_val, list):
-                    title_val = " ".join(title_val)
-                title_val = BeautifulSoup(
-                    title_val, "html.parser").get_text().strip()
-                
-                # Extract and clean citing abstract.
-                abstract_val = data.get("abstract", "")
-                if isinstance(abstract_val, list):
-                    abstract_val = " ".join(abstract_val)
-                abstract_val = BeautifulSoup(abstract_val, \
-                                             "html.parser").get_text().strip()
-                return (apsr_title, doi, title_val, abstract_val, url)
-
-            with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-                futures = {executor.submit(
-                    ProcessAbstractRow, pair): pair for pair in to_process}
-                for future in concurrent.futures.as_completed(futures):
+                             f"Failed to process abstract batch: {e}")
+
+            async def ConsumeAbstractRows(pbar):
+                while True:
+                    result = await results.get()
+                    if result is None:
+                        break
+                    # Log a failed write and keep draining the queue.
                     try:
-                        apsr_title, doi, citing_title, citing_abstract, crossref_url = future.result()
-                        with self.abstract_lock:
-                            self.abstract_cache[doi] = {
-                                'apsr_title': apsr_title,
-                                'citing_doi': doi,
-                                'citing_title': citing_title,
-                                'citing_abstract': citing_abstract,
-                                'crossref_url': crossref_url
-                            }
+                        # Results are (citing_doi, *ABSTRACT_COLUMNS[2:]).
+                        self.abstract_cache[result[0]] = result[1:]
                     except Exception as e:
                         fn, line = self.log_helper()
                         self.Log("error", fn, line,
-                                 f"Failed to process abstract row: {e}")
-                        continue
-
-                    processed_count += 1
-                    # Update the progress bar on every processed abstract.
-                    self.ProgressBar(
-                        processed_count, total_to_process, prefix="Processing Abstracts")
-
-                    # (Batch update) Every 100 processed abstracts, flush CSV and pickle out.
-                    if processed_count % 100 == 0:
-                        self.OutputCSV(pd.DataFrame.from_dict(self.abstract_cache, orient='index'),
-                                       self.abstract_map_csv_path)
-                        with open(self.abstract_cache_path, "wb") as f:
-                            pickle.dump(self.abstract_cache, f)
-                        # Force an immediate progress update after flushing.
-                        self.ProgressBar(
-                            processed_count, total_to_process, prefix="Processing Abstracts")
-
-            # Final CSV and pickle update after processing is complete.
-            self.OutputCSV(pd.DataFrame.from_dict(self.abstract_cache, orient='index'),
-                           self.abstract_map_csv_path)
-            with open(self.abstract_cache_path, "wb") as f:
-                pickle.dump(self.abstract_cache, f)
+                                 f"Failed to record abstract for {result[0]}: {e}")
+                    pbar.update(1)
+
+            with tqdm(total=total_to_process, desc="Processing Abstracts") as pbar:
+                consumer = asyncio.create_task(ConsumeAbstractRows(pbar))
+                await self.RunWorkers(ProduceAbstractBatch,
+                                      ((pbar, unique_dois[i:i + self.crossref_batch_size])
+                                       for i in range(0, len(unique_dois), self.crossref_batch_size)),
+                                      self.crossref_max_connections)
+                # Signal the consumer that every producer has finished.
+                await results.put(None)
+                await consumer
+
+            # Export the abstract map as Parquet and CSV after processing is complete.
+            self.OutputCSV(self.SaveAbstractMap(), self.abstract_map_csv_path)
         except Exception as e:
             fn, line = self.log_helper()
             self.Log("error", fn, line, f"Failed to process abstracts: {e}")
@@ -361,12 +577,13 @@ class PostProcessAPSR:
 if __name__ == "__main__":
     try:
         pproc = PostProcessAPSR(attempt_cache_load=True)
-        pproc.PostProcessCitations()
-        pproc.PostProcessAbstracts()
+        asyncio.run(pproc.Run())
     except Exception as e:
         print(f'[ failure ]: {e}')
     finally:
-        pproc.session.close()
+        pproc.http_cache.close()
+        pproc.citation_data.close()
+        pproc.abstract_cache.close()
         total_logs = sum(len(messages) for messages in pproc.log.values())
         if total_logs > 0:
             print(